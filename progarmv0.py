@@ -4,20 +4,51 @@ import json
 import subprocess
 import platform
 import urllib.request
+import urllib.error
 import zipfile
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, font
 import re
 import hashlib
+import functools
+import uuid
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Prefer orjson's C parser for the big Mojang manifests; fall back to stdlib json
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj, indent=2):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj, indent=2):
+        return json.dumps(obj, indent=indent).encode()
 
 # ====== Constants ======
 MINECRAFT_DIR = os.path.expanduser("~/.minecraft")
 VERSIONS_DIR = os.path.join(MINECRAFT_DIR, "versions")
 JAVA_DIR = os.path.expanduser("~/.catclient/java")
-VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
+CACHE_DIR = os.path.expanduser("~/.catclient")
+# v2 manifest is the same schema plus a sha1 per version json
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+MANIFEST_CACHE = os.path.join(CACHE_DIR, "version_manifest.json")
+MANIFEST_META = os.path.join(CACHE_DIR, "manifest.meta.json")
+
+# Matches ${placeholder} tokens in game arguments
+PLACEHOLDER_RE = re.compile(r'\$\{[A-Za-z_]+\}')
+
+# Manifest version "type" -> launcher category
+VERSION_TYPES = {"release": "Release", "snapshot": "Snapshot", "old_beta": "Old Beta", "old_alpha": "Old Alpha"}
 
 ACCOUNTS_FILE = "accounts.json"
 PROFILES_FILE = "profiles.json"
+SETTINGS_FILES = {'accounts': ACCOUNTS_FILE, 'profiles': PROFILES_FILE}
 
 # ====== Style for modern look ======
 # Use a clean font
@@ -43,6 +74,33 @@ def style_button(btn):
         relief='flat'
     )
 
+# Write via a sibling temp file so readers never see a half-written file
+def write_atomic(filepath, data):
+    tmp = filepath + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, filepath)
+
+# Mojang's sha1s are integrity checks, so let OpenSSL skip the FIPS-guarded path
+def new_sha1():
+    return hashlib.new('sha1', usedforsecurity=False)
+
+class ChecksumError(Exception):
+    pass
+
+# Mojang's rule names for the running platform
+def current_os_name():
+    name = platform.system().lower()
+    return "osx" if name == "darwin" else name
+
+# Offline-mode UUID, derived the same way as the vanilla server (v3 of "OfflinePlayer:<name>")
+@functools.lru_cache(maxsize=64)
+def offline_uuid(username):
+    digest = bytearray(hashlib.md5(("OfflinePlayer:" + username).encode()).digest())
+    digest[6] = (digest[6] & 0x0f) | 0x30
+    digest[8] = (digest[8] & 0x3f) | 0x80
+    return str(uuid.UUID(bytes=bytes(digest)))
+
 # Utility for custom styled buttons
 def create_button(parent, text, command):
     btn = tk.Button(parent, text=text, command=command)
@@ -50,6 +108,8 @@ def create_button(parent, text, command):
     return btn
 
 class CatClient(tk.Tk):
+    VERSION_CATEGORIES = ("Latest Release", "Latest Snapshot", "Release", "Snapshot", "Old Beta", "Old Alpha")
+
     def __init__(self):
         super().__init__()
         self.title("CatClient 1.a")
@@ -59,26 +119,47 @@ class CatClient(tk.Tk):
         self.accounts = self.load_json(ACCOUNTS_FILE)
         self.profiles = self.load_json(PROFILES_FILE)
         self.versions = {}
-        self.version_categories = {
-            "Latest Release": [],
-            "Latest Snapshot": [],
-            "Release": [],
-            "Snapshot": [],
-            "Old Beta": [],
-            "Old Alpha": []
-        }
+        self.version_sha1s = {}
+        self._verified = {}
+        self._version_cache = {}
+        self._launch_cache = {}
+        # Worker threads hand callbacks to the Tk thread through this queue
+        self._ui_queue = queue.Queue()
+        self._launching = False
+        # Settings files waiting to be written, flushed shortly after the last change
+        self._dirty = set()
+        self._flush_pending = False
+        self.version_categories = {k: [] for k in self.VERSION_CATEGORIES}
+        self._shown_category = None
         self.create_widgets()
-        self.load_version_manifest()
+        self.after(100, self._poll_ui_queue)
+        self.protocol("WM_DELETE_WINDOW", self._flush_dirty_and_quit)
+        threading.Thread(target=self._bg_load_manifest, daemon=True).start()
 
     def load_json(self, filepath):
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return _loads(f.read())
         return {}
 
     def save_json(self, data, filepath):
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_atomic(filepath, _dumps(data))
+
+    def _mark_dirty(self, name):
+        self._dirty.add(name)
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.after(500, self._flush_dirty)
+
+    def _flush_dirty(self):
+        self._flush_pending = False
+        while self._dirty:
+            name = self._dirty.pop()
+            self.save_json(getattr(self, name), SETTINGS_FILES[name])
+
+    def _flush_dirty_and_quit(self):
+        self._flush_dirty()
+        self.destroy()
 
     def create_widgets(self):
         # Use ttk Notebook for tabs
@@ -129,7 +210,7 @@ class CatClient(tk.Tk):
         ver_frame = tk.LabelFrame(left_frame, text="GAME VERSION", bg=BG_COLOR, fg=FG_COLOR, relief='flat')
         ver_frame.pack(fill='x', pady=10)
         self.category_var = tk.StringVar()
-        self.category_combo = ttk.Combobox(ver_frame, values=list(self.version_categories.keys()), textvariable=self.category_var, state='readonly')
+        self.category_combo = ttk.Combobox(ver_frame, values=self.VERSION_CATEGORIES, textvariable=self.category_var, state='readonly')
         self.category_combo.pack(fill='x', padx=10, pady=5)
         self.category_combo.set("Latest Release")
         self.category_combo.bind("<<ComboboxSelected>>", self.update_version_list)
@@ -153,9 +234,12 @@ class CatClient(tk.Tk):
         ram_lbl_frame.pack(fill='x', padx=10, pady=(10,0))
         self.ram_label = ttk.Label(ram_lbl_frame, text="4GB", background=BG_COLOR, foreground=FG_COLOR, font=BASE_FONT)
         self.ram_label.pack(side='left')
-        self.ram_scale = tk.Scale(ram_lbl_frame, from_=1, to=16, orient='horizontal', bg=BG_COLOR, fg=FG_COLOR, highlightthickness=0, troughcolor=ENTRY_BG, command=lambda v: self.ram_label.config(text=f"{int(float(v))}GB"))
-        self.ram_scale.set(4)
+        self.ram_var = tk.IntVar(value=4)
+        self.ram_scale = tk.Scale(ram_lbl_frame, from_=1, to=16, variable=self.ram_var, orient='horizontal', bg=BG_COLOR, fg=FG_COLOR, highlightthickness=0, troughcolor=ENTRY_BG)
         self.ram_scale.pack(fill='x', padx=0, pady=5)
+        # Relabel at most once per event-loop turn while dragging
+        self._ram_label_pending = False
+        self.ram_var.trace_add('write', self._schedule_ram_label)
 
         # Buttons
         btn_frame = tk.Frame(left_frame, bg=BG_COLOR)
@@ -168,6 +252,8 @@ class CatClient(tk.Tk):
         btn_launch.pack(fill='x', pady=5)
         btn_launch.bind("<Enter>", lambda e: e.widget.config(bg=ACCENT_COLOR))
         btn_launch.bind("<Leave>", lambda e: e.widget.config(bg=ACCENT_COLOR))
+        self.progress = ttk.Progressbar(btn_frame, mode='determinate')
+        self.progress.pack(fill='x', pady=5)
 
         # Main Content (Right side)
         content_frame = ttk.Frame(frame)
@@ -186,6 +272,15 @@ class CatClient(tk.Tk):
             lbl = ttk.Label(content_frame, text=item, wraplength=600, font=BASE_FONT, foreground=FG_COLOR)
             lbl.pack(anchor='w', padx=20, pady=2)
 
+    def _schedule_ram_label(self, *_):
+        if not self._ram_label_pending:
+            self._ram_label_pending = True
+            self.after_idle(self._update_ram_label)
+
+    def _update_ram_label(self):
+        self._ram_label_pending = False
+        self.ram_label.config(text=f"{self.ram_var.get()}GB")
+
     def build_profile_tab(self):
         frame = self.tab_profile
         ttk.Label(frame, text="Accounts", font=TITLE_FONT).pack(pady=10)
@@ -220,7 +315,7 @@ class CatClient(tk.Tk):
         username = simple_input(self, "Enter username:")
         if username:
             self.accounts[username] = {}
-            self.save_json(self.accounts, ACCOUNTS_FILE)
+            self._mark_dirty('accounts')
             self.refresh_account_list()
 
     def remove_account(self):
@@ -229,7 +324,7 @@ class CatClient(tk.Tk):
             username = self.acc_listbox.get(sel)
             if username in self.accounts:
                 del self.accounts[username]
-                self.save_json(self.accounts, ACCOUNTS_FILE)
+                self._mark_dirty('accounts')
                 self.refresh_account_list()
 
     def save_current_profile(self):
@@ -238,11 +333,11 @@ class CatClient(tk.Tk):
             profile = {
                 'version': self.version_var.get(),
                 'username': self.username_entry.get(),
-                'ram': self.ram_scale.get(),
+                'ram': self.ram_var.get(),
                 'mod_folder': self.mod_folder_var.get()
             }
             self.profiles[name] = profile
-            self.save_json(self.profiles, PROFILES_FILE)
+            self._mark_dirty('profiles')
             self.refresh_profiles()
 
     def refresh_profiles(self):
@@ -255,7 +350,7 @@ class CatClient(tk.Tk):
             self.version_var = profile.get('version', '')
             self.username_entry.delete(0, tk.END)
             self.username_entry.insert(0, profile.get('username', ''))
-            self.ram_scale.set(profile.get('ram', 4))
+            self.ram_var.set(profile.get('ram', 4))
             self.mod_folder_var.set(profile.get('mod_folder', ''))
         else:
             messagebox.showinfo("Info", "Profile not found.")
@@ -266,37 +361,95 @@ class CatClient(tk.Tk):
         if fold:
             self.mod_folder_var.set(fold)
 
+    # --- Background work ---
+    def _post(self, func, *args):
+        self._ui_queue.put((func, args))
+
+    def _poll_ui_queue(self):
+        try:
+            while True:
+                func, args = self._ui_queue.get_nowait()
+                try:
+                    func(*args)
+                except Exception as e:
+                    # Keep pumping; one failed callback must not stall the UI
+                    print("UI callback error:", e)
+        except queue.Empty:
+            pass
+        finally:
+            self.after(100, self._poll_ui_queue)
+
+    def _set_progress(self, done, total):
+        self.progress['maximum'] = total
+        self.progress['value'] = done
+
     # --- Load version manifest ---
-    def load_version_manifest(self):
+    def _bg_load_manifest(self):
+        # Runs on a worker thread so the window stays responsive
+        try:
+            manifest = _loads(self.fetch_manifest())
+        except Exception as e:
+            print("Version manifest load error:", e)
+            return
+        self._post(self._apply_manifest, manifest)
+
+    def _apply_manifest(self, manifest):
         try:
-            with urllib.request.urlopen(VERSION_MANIFEST_URL) as url:
-                manifest = json.loads(url.read().decode())
             latest_rel = manifest["latest"]["release"]
             latest_snap = manifest["latest"]["snapshot"]
             # Clear categories
-            for k in self.version_categories:
-                self.version_categories[k] = []
+            cats = self.version_categories
+            for k in cats:
+                cats[k] = []
             for v in manifest["versions"]:
                 vid = v["id"]
                 self.versions[vid] = v["url"]
-                if vid == latest_rel:
-                    self.version_categories["Latest Release"].append(vid)
-                elif vid == latest_snap:
-                    self.version_categories["Latest Snapshot"].append(vid)
-                elif v["type"] == "release":
-                    self.version_categories["Release"].append(vid)
-                elif v["type"] == "snapshot":
-                    self.version_categories["Snapshot"].append(vid)
-                elif v["type"] == "old_beta":
-                    self.version_categories["Old Beta"].append(vid)
-                elif v["type"] == "old_alpha":
-                    self.version_categories["Old Alpha"].append(vid)
+                self.version_sha1s[vid] = v.get("sha1")
+                cat = VERSION_TYPES.get(v["type"])
+                if cat:
+                    cats[cat].append(vid)
+            cats["Latest Release"] = [latest_rel]
+            cats["Latest Snapshot"] = [latest_snap]
+            # Newest first, sorted once here rather than on every selection
+            release_times = {v["id"]: v.get("releaseTime", "") for v in manifest["versions"]}
+            for lst in self.version_categories.values():
+                lst.sort(key=release_times.__getitem__, reverse=True)
+            self._shown_category = None
             self.update_version_list()
         except Exception as e:
             print("Version manifest load error:", e)
 
+    def fetch_manifest(self):
+        # Conditional GET: only pull the body when ETag/Last-Modified changed
+        meta = self.load_json(MANIFEST_META) if os.path.exists(MANIFEST_CACHE) else {}
+        req = urllib.request.Request(VERSION_MANIFEST_URL)
+        if meta.get('etag'):
+            req.add_header('If-None-Match', meta['etag'])
+        if meta.get('last_modified'):
+            req.add_header('If-Modified-Since', meta['last_modified'])
+        try:
+            with urllib.request.urlopen(req) as r:
+                data = r.read()
+                meta = {'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified')}
+        except urllib.error.URLError as e:
+            # 304 means our copy is current; any other failure (e.g. offline) falls back to it too
+            not_modified = isinstance(e, urllib.error.HTTPError) and e.code == 304
+            if not (not_modified or os.path.exists(MANIFEST_CACHE)):
+                raise
+            if not not_modified:
+                print("Manifest fetch failed, using cached copy:", e)
+            with open(MANIFEST_CACHE, 'rb') as f:
+                return f.read()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_atomic(MANIFEST_CACHE, data)
+        write_atomic(MANIFEST_META, _dumps(meta))
+        return data
+
     def update_version_list(self, event=None):
         cat = self.category_var.get()
+        if cat == self._shown_category:
+            return
+        self._shown_category = cat
         vlist = self.version_categories.get(cat, [])
         self.version_combo['values'] = vlist
         if vlist:
@@ -307,7 +460,7 @@ class CatClient(tk.Tk):
         self.install_java_if_needed()
         version = self.version_combo.get()
         username = self.username_entry.get()
-        ram = self.ram_scale.get()
+        ram = self.ram_var.get()
         mod_folder = self.mod_folder_var.get()
         self.download_and_launch(version, username, ram, mod_folder)
 
@@ -319,87 +472,226 @@ class CatClient(tk.Tk):
         if not version_url:
             messagebox.showerror("Error", "Version URL missing.")
             return
-        self.download_version_files(version, version_url)
+        if self._launching:
+            return
+        self._launching = True
+        self._set_progress(0, 1)
+        threading.Thread(target=self._bg_download, args=(version, version_url, username, ram, mod_folder), daemon=True).start()
+
+    def _bg_download(self, version, version_url, username, ram, mod_folder):
+        try:
+            self.download_version_files(version, version_url)
+        finally:
+            self._post(self._finish_launch, version, username, ram, mod_folder)
+
+    def _finish_launch(self, version, username, ram, mod_folder):
+        self._launching = False
         cmd = self.build_launch_command(version, username, ram, mod_folder)
         if cmd:
             # Launch Minecraft
             print("Launching:", " ".join(cmd))
-            subprocess.Popen(cmd)
+            # Detach the game so it holds no launcher handles or console pipes
+            kwargs = {}
+            if platform.system() == "Windows":
+                kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                kwargs['start_new_session'] = True
+            subprocess.Popen(cmd, close_fds=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
 
     def download_version_files(self, version_id, version_url):
-        print(f"⬇️ Downloading {version_id}")
         version_dir = os.path.join(VERSIONS_DIR, version_id)
+        json_path = os.path.join(version_dir, f"{version_id}.json")
+        jar_path = os.path.join(version_dir, f"{version_id}.jar")
+        json_sha1 = self.version_sha1s.get(version_id)
+        # Already installed and intact: no network at all
+        if os.path.exists(json_path) and os.path.exists(jar_path) and (not json_sha1 or self.is_cached(json_path, json_sha1)):
+            try:
+                tasks = self._version_tasks(version_id, self._load_version_json(version_id))
+                if all(self._verify_all([(path, sha1sum) for _, path, sha1sum in tasks])):
+                    self._post(self._set_progress, 1, 1)
+                    return
+            except (OSError, ValueError, KeyError) as e:
+                print("Cached version unusable, downloading:", e)
+        print(f"⬇️ Downloading {version_id}")
         os.makedirs(version_dir, exist_ok=True)
-        # Download version JSON
+        # Download version JSON, unless the local copy still matches the manifest sha1
         try:
-            with urllib.request.urlopen(version_url) as r:
-                data = json.loads(r.read().decode())
-            with open(os.path.join(version_dir, f"{version_id}.json"), 'w') as f:
-                json.dump(data, f, indent=2)
-            # Download client jar
-            client_url = data["downloads"]["client"]["url"]
-            sha1 = data["downloads"]["client"]["sha1"]
-            jar_path = os.path.join(version_dir, f"{version_id}.jar")
-            if not (os.path.exists(jar_path) and self.verify_file(jar_path, sha1)):
-                urllib.request.urlretrieve(client_url, jar_path)
-                if not self.verify_file(jar_path, sha1):
-                    messagebox.showerror("Error", "JAR checksum mismatch")
+            if json_sha1 and self.is_cached(json_path, json_sha1):
+                data = self._load_version_json(version_id)
+            else:
+                with urllib.request.urlopen(version_url) as r:
+                    raw = r.read()
+                data = _loads(raw)
+                # Keep Mojang's bytes as-is so the sha1 check holds next time
+                write_atomic(json_path, raw)
+                self._version_cache[version_id] = (os.stat(json_path).st_mtime_ns, data)
+            tasks = self._version_tasks(version_id, data)
+            ok = self._verify_all([(path, sha1sum) for _, path, sha1sum in tasks])
+            tasks = [t for t, good in zip(tasks, ok) if not good]
+            if tasks:
+                # Downloads are network-bound, so overlap them
+                with ThreadPoolExecutor(max_workers=16) as ex:
+                    for done, _ in enumerate(ex.map(self._fetch_one, tasks), 1):
+                        self._post(self._set_progress, done, len(tasks))
+            else:
+                self._post(self._set_progress, 1, 1)
+        except ChecksumError as e:
+            print("Error downloading files:", e)
+            self._post(messagebox.showerror, "Error", "JAR checksum mismatch")
         except Exception as e:
             print("Error downloading files:", e)
 
+    def _version_tasks(self, version_id, data):
+        # (url, path, sha1) for the client jar and every library allowed on this OS
+        client = data["downloads"]["client"]
+        tasks = [(client["url"], os.path.join(VERSIONS_DIR, version_id, f"{version_id}.jar"), client["sha1"])]
+        current_os = current_os_name()
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        for lib in data.get("libraries", []):
+            artifact = lib.get("downloads", {}).get("artifact")
+            if not artifact or not self.evaluate_rules(lib.get("rules"), current_os):
+                continue
+            tasks.append((artifact["url"], os.path.join(libraries_dir, artifact["path"]), artifact["sha1"]))
+        return tasks
+
+    def _fetch_one(self, task):
+        url, filepath, sha1sum = task
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self.download_verified(url, filepath, sha1sum)
+
+    def _verify_all(self, pairs):
+        # hashlib releases the GIL while hashing, so threads check files side by side
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as ex:
+            return list(ex.map(lambda p: self.is_cached(*p), pairs))
+
+    def is_cached(self, filepath, sha1sum):
+        # Remember verified files by (mtime, size) so repeat checks skip hashing
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return False
+        key = (st.st_mtime_ns, st.st_size, sha1sum)
+        if self._verified.get(filepath) == key:
+            return True
+        if self.verify_file(filepath, sha1sum):
+            self._verified[filepath] = key
+            return True
+        return False
+
+    def download_verified(self, url, filepath, sha1sum):
+        # Hash while streaming to a .part file, then swap it in only on a match
+        part = filepath + '.part'
+        hash_obj = new_sha1()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        try:
+            with urllib.request.urlopen(url) as r, open(part, 'wb') as out:
+                while n := r.readinto(buf):
+                    out.write(view[:n])
+                    hash_obj.update(view[:n])
+            if hash_obj.hexdigest() != sha1sum:
+                raise ChecksumError(f"checksum mismatch for {url}")
+        except BaseException:
+            # Never leave a partial download behind
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        os.replace(part, filepath)
+        st = os.stat(filepath)
+        self._verified[filepath] = (st.st_mtime_ns, st.st_size, sha1sum)
+
     def verify_file(self, filepath, sha1sum):
-        hash_obj = hashlib.sha1()
-        with open(filepath, 'rb') as f:
-            hash_obj.update(f.read())
+        # Hash in 1 MiB chunks instead of reading whole jars into memory
+        with open(filepath, 'rb', buffering=0) as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, new_sha1).hexdigest() == sha1sum
+            hash_obj = new_sha1()
+            buf = bytearray(1 << 20)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                hash_obj.update(view[:n])
         return hash_obj.hexdigest() == sha1sum
 
+    def _load_version_json(self, version_id):
+        # Parsed version JSONs are reused until the file on disk changes
+        path = os.path.join(VERSIONS_DIR, version_id, f"{version_id}.json")
+        st = os.stat(path)
+        cached = self._version_cache.get(version_id)
+        if cached and cached[0] == st.st_mtime_ns:
+            return cached[1]
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
+        self._version_cache[version_id] = (st.st_mtime_ns, data)
+        return data
+
     def build_launch_command(self, version, username, ram, mod_folder=None):
-        version_dir = os.path.join(VERSIONS_DIR, version)
-        json_path = os.path.join(version_dir, f"{version}.json")
+        json_path = os.path.join(VERSIONS_DIR, version, f"{version}.json")
         try:
-            with open(json_path) as f:
-                version_data = json.load(f)
-        except:
+            mtime = os.stat(json_path).st_mtime_ns
+            version_data = self._load_version_json(version)
+        except (OSError, ValueError, KeyError):
             messagebox.showerror("Error", "Cannot read version json.")
             return []
+        static_cmd, game_template = self._launch_template(version, version_data, mtime)
+        # Only the per-player placeholders are left in the cached game args
+        replacements = {
+            "${auth_player_name}": username,
+            "${auth_uuid}": self.generate_offline_uuid(username),
+        }
+        return [static_cmd[0], f"-Xmx{ram}G", *static_cmd[1:], *self._substitute(game_template, replacements)]
+
+    def _substitute(self, args, replacements):
+        # Build the substitution callback once instead of a lambda per arg;
+        # unknown placeholders are left as-is
+        lookup = replacements.get
+        def fill(m):
+            ph = m.group(0)
+            return lookup(ph, ph)
+        sub = PLACEHOLDER_RE.sub
+        return [sub(fill, a) for a in args]
+
+    def _launch_template(self, version, version_data, mtime):
+        # Everything but RAM and player identity, reused until the version json changes
+        key = (version, mtime)
+        cached = self._launch_cache.get(key)
+        if cached:
+            return cached
+        version_dir = os.path.join(VERSIONS_DIR, version)
 
-        current_os = platform.system().lower()
-        if current_os=="darwin": current_os="osx"
+        current_os = current_os_name()
         main_class = version_data.get("mainClass", "net.minecraft.client.main.Main")
-        classpath = []
 
-        jar_path = os.path.join(version_dir, f"{version}.jar")
-        classpath = [jar_path]
-        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
-        for lib in version_data.get("libraries", []):
-            if "downloads" in lib and "artifact" in lib["downloads"]:
-                path = lib["downloads"]["artifact"]["path"]
-                classpath.append(os.path.join(libraries_dir, path))
-        classpath_str = ';'.join(classpath) if current_os=='windows' else ':'.join(classpath)
+        # Same client jar + OS-filtered libraries that download_version_files installs
+        sep = ';' if current_os=='windows' else ':'
+        classpath_str = sep.join([path for _, path, _ in self._version_tasks(version, version_data)])
 
         java_exe = "java"
         # if Java missing, handle differently
         if not self.is_java_installed():
             java_exe = os.path.join(JAVA_DIR, "jdk-21.0.5+11", "bin", "java.exe" if current_os=='windows' else "java")
 
-        cmd = [java_exe, f"-Xmx{ram}G"]
+        cmd = [java_exe]
 
-        # JVM arguments
+        # JVM arguments, noting the flags we would otherwise add ourselves
+        has_libpath = False
+        has_first_thread = False
         if "arguments" in version_data:
             for arg in version_data["arguments"].get("jvm", []):
                 if isinstance(arg, str):
-                    cmd.append(arg)
-                elif isinstance(arg, dict) and "rules" in arg and "value" in arg:
-                    if self.evaluate_rules(arg["rules"], current_os):
-                        val = arg["value"]
-                        if isinstance(val, list):
-                            cmd.extend(val)
-                        else:
-                            cmd.append(val)
-        if current_os=="osx" and "-XstartOnFirstThread" not in cmd:
+                    vals = (arg,)
+                elif isinstance(arg, dict) and "rules" in arg and "value" in arg and self.evaluate_rules(arg["rules"], current_os):
+                    val = arg["value"]
+                    vals = val if isinstance(val, list) else (val,)
+                else:
+                    continue
+                for a in vals:
+                    has_libpath = has_libpath or a.startswith("-Djava.library.path")
+                    has_first_thread = has_first_thread or a == "-XstartOnFirstThread"
+                cmd.extend(vals)
+        if current_os=="osx" and not has_first_thread:
             cmd.append("-XstartOnFirstThread")
         natives_path = os.path.join(version_dir, "natives")
-        if not any("-Djava.library.path" in a for a in cmd):
+        if not has_libpath:
             cmd.append(f"-Djava.library.path={natives_path}")
 
         # Game args
@@ -418,42 +710,43 @@ class CatClient(tk.Tk):
         elif "minecraftArguments" in version_data:
             game_args = version_data["minecraftArguments"].split()
 
-        uuid = self.generate_offline_uuid(username)
         replacements = {
-            "${auth_player_name}": username,
             "${version_name}": version,
             "${game_directory}": MINECRAFT_DIR,
             "${assets_root}": os.path.join(MINECRAFT_DIR,"assets"),
             "${assets_index_name}": version_data.get("assetIndex",{}).get("id","legacy"),
-            "${auth_uuid}": uuid,
             "${auth_access_token}": "0",
             "${user_type}": "legacy",
             "${version_type}": version_data.get("type","release"),
             "${user_properties}": "{}",
             "${quickPlayRealms}": ""
         }
-        def replace_ph(a):
-            for k,v in replacements.items():
-                a = a.replace(k,v)
-            return a
-        game_args = [replace_ph(a) for a in game_args]
+        game_args = self._substitute(game_args, replacements)
         cmd.extend(["-cp", classpath_str, main_class])
-        cmd.extend(game_args)
-        return cmd
+        cached = self._launch_cache[key] = (cmd, game_args)
+        return cached
+
+    def generate_offline_uuid(self, username):
+        return offline_uuid(username)
 
     def evaluate_rules(self, rules, os_name):
         # Simplified rules evaluator
         if not rules:
             return True
+        if len(rules) == 1:
+            # Most args carry a single allow rule
+            r = rules[0]
+            return "features" not in r and r["action"]=="allow" and ("os" not in r or r["os"].get("name")==os_name)
         allowed = False
         for r in rules:
             if "features" in r:
                 continue
+            os_match = "os" not in r or r["os"].get("name")==os_name
             if r["action"]=="allow":
-                if "os" not in r or r.get("os",{}).get("name")==os_name:
+                if os_match:
                     allowed=True
             elif r["action"]=="disallow":
-                if "os" in r and r.get("os",{}).get("name")==os_name:
+                if "os" in r and os_match:
                     allowed=False
         return allowed
 